@@ -5,7 +5,7 @@ import logging
 import json
 
 from models import GuildSettings, User
-from services import GuildService
+from services import GuildService, ValidationError
 
 # Commands:
 # Toggle subscriptions
@@ -98,7 +98,12 @@ class admin(commands.Cog):
         inter: disnake.ApplicationCommandInteraction,
         webhook_url: str
     ) -> None:
-        await GuildService.add_webhook(inter.guild_id, webhook_url, inter.guild.name)
+        try:
+            await GuildService.add_webhook(inter.guild_id, webhook_url, inter.guild.name)
+        except ValidationError:
+            embed = disnake.Embed(description="That is not a valid Discord webhook URL.")
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
         embed = disnake.Embed(description="Webhook assigned successfully.")
         await inter.response.send_message(embed=embed, ephemeral=True)
 
@@ -4,16 +4,14 @@ import asyncio
 import logging
 import sys
 
-from discord_webhook import AsyncDiscordWebhook
-
 from services import (
     ServiceConfig,
     NotificationService,
     PermissionService,
-    WebhookValidationService,
     InMemoryUsernameCache,
     CircularDeduplicationCache,
     GuildService,
+    PayloadParsingService,
 )
 from repositories import UserRepository
 
@@ -45,6 +43,13 @@ class DiscordBotGatewayAdapter:
         """Get user from bot cache."""
         return self._bot.get_user(user_id)
     
+    def get_member(self, guild_id: int, user_id: int):
+        """Get member from bot cache."""
+        guild = self._bot.get_guild(guild_id)
+        if not guild:
+            return None
+        return guild.get_member(user_id)
+    
     async def fetch_member(self, guild_id: int, user_id: int):
         """Fetch member from Discord API."""
         guild = self._bot.get_guild(guild_id)
@@ -76,6 +81,12 @@ class WebSocketClient:
         self._bot = bot
         self._config = ServiceConfig.from_environment()
         
+        if self._config.websocket.max_message_size <= PayloadParsingService.STREAM_THRESHOLD:
+            logger.warning(
+                "WS_MAX_MESSAGE_SIZE is not above the streaming parse threshold; "
+                "oversized payloads will close the connection instead of being stream-parsed"
+            )
+        
         # Queue for message processing
         self.queue = asyncio.Queue(maxsize=self._config.queue.max_size)
         
@@ -99,7 +110,6 @@ class WebSocketClient:
         ├── CircularDeduplicationCache (duplicate detection)
         ├── PermissionService (role checks)
         │   └── DiscordBotGatewayAdapter (Discord API)
-        ├── WebhookValidationService (URL validation)
         └── GuildService.get_user_destinations (destination loading)
         """
         if self._notification_service is not None:
@@ -113,6 +123,9 @@ class WebSocketClient:
             db_loader=UserRepository.get_all_active_usernames
         )
         
+        # Report (but keep) webhooks stored before write-time validation
+        await GuildService.report_invalid_webhooks()
+        
         # Load initial usernames
         await self._username_cache.refresh_from_db()
         logger.info(f"Loaded {len(self._username_cache)} usernames into cache")
@@ -127,22 +140,23 @@ class WebSocketClient:
             enable_cache=True,
         )
         
-        # Create webhook validator
-        webhook_validator = WebhookValidationService(self._config.validation)
-        
         # Create notification service (main orchestrator)
         self._notification_service = NotificationService(
             username_cache=self._username_cache,
             dedup_cache=dedup_cache,
             permission_service=permission_service,
-            webhook_validator=webhook_validator,
             destination_loader=GuildService.get_user_destinations,
             config=self._config.notification,
-            bot_avatar_url=None,  # Set dynamically per request
+            bot_avatar_url=None,  # Set by queue_processor once the bot is logged in
         )
         
         logger.info("Service layer initialized")
     
+    async def close(self) -> None:
+        """Release service layer resources."""
+        if self._notification_service is not None:
+            await self._notification_service.close()
+    
     # ─────────────────────────────────────────────────────────────────
     # Public Cache Interface (for cog integration)
     # ─────────────────────────────────────────────────────────────────
@@ -212,6 +226,7 @@ class WebSocketClient:
                     ws_config.uri,
                     additional_headers={"token": f"{api_key}"},
                     close_timeout=ws_config.close_timeout,
+                    max_size=ws_config.max_message_size,
                 ) as websocket:
                     await self._handle_connection(websocket, ready_event, ws_config.zombie_timeout)
                     
@@ -265,7 +280,7 @@ class WebSocketClient:
             try:
                 # Wait for message with zombie detection timeout
                 message = await asyncio.wait_for(
-                    websocket.recv(),
+                    websocket.recv(decode=False),  # Raw bytes, parsed without decoding
                     timeout=zombie_timeout,
                 )
             except asyncio.TimeoutError:
@@ -291,7 +306,7 @@ class WebSocketClient:
             # Enqueue for processing with backpressure handling
             await self._enqueue_message(message)
     
-    async def _enqueue_message(self, message: str) -> None:
+    async def _enqueue_message(self, message: str | bytes) -> None:
         """Enqueue message with backpressure handling."""
         packet = {"payload": message}
         
@@ -316,8 +331,8 @@ class WebSocketClient:
         """
         Process queued messages.
         
-        Intentionally simple and direct to avoid blocking the event loop.
-        Matches the original proven-working implementation pattern.
+        Each payload is handed to NotificationService, which queues webhook
+        deliveries and returns without waiting for them to be sent.
         """
         await self._init_services()
         
@@ -332,84 +347,21 @@ class WebSocketClient:
                 raw_json = packet["payload"]
                 
                 try:
-                    # Parse payload
-                    parse_result = self._notification_service._parser.parse_raw_message(raw_json)
-                    
-                    if not parse_result.embeds:
-                        self.queue.task_done()
-                        continue
+                    # Bot user is only known after login, so refresh per message
+                    if self._bot.user:
+                        self._notification_service.set_bot_avatar_url(
+                            self._bot.user.display_avatar.url
+                        )
                     
-                    # Process each embed
-                    for embed in parse_result.embeds:
-                        # Check if username is tracked
-                        if not self._username_cache.contains(embed.name):
-                            continue
-                        
-                        # Load destinations from DB - YIELDS to event loop
-                        try:
-                            destinations = await GuildService.get_user_destinations(embed.name)
-                            webhooks, user_id = destinations
-                        except Exception:
-                            logger.debug(f"No destinations for {embed.name}")
-                            continue
-                        
-                        # ALWAYS yield after DB operation
-                        await asyncio.sleep(0)
-                        
-                        if not webhooks:
-                            continue
-                        
-                        # Build Discord user info
-                        user = self._bot.get_user(user_id)
-                        if user:
-                            user_mention = f"<@{user.id}>"
-                            avatar_url = user.display_avatar.url
-                        else:
-                            user_mention = "Unknown User"
-                            avatar_url = "https://cdn.discordapp.com/embed/avatars/0.png"
-                        
-                        # Build Discord embed
-                        discord_embed = self._notification_service._build_discord_embed(embed, user_id, self._bot)
-                        
-                        # Determine if exceptional find
-                        content = self._notification_service._get_content_message(embed)
-                        
-                        # Send to each webhook sequentially
-                        for url, guild_id, required_role_id in webhooks:
-                            try:
-                                # Check permission - YIELDS to event loop
-                                if not await self._notification_service._permissions.check_user_permission(
-                                    guild_id, user_id, required_role_id
-                                ):
-                                    continue
-                                
-                                # YIELD after permission check
-                                await asyncio.sleep(0)
-                                
-                                # Validate URL
-                                if not self._notification_service._webhook_validator.is_valid(url):
-                                    continue
-                                
-                                # Send webhook - YIELDS to event loop
-                                webhook = AsyncDiscordWebhook(
-                                    url=url,
-                                    content=content,
-                                    username="Solsbot Helper",
-                                    avatar_url=self._bot.user.display_avatar.url if self._bot.user else None,
-                                )
-                                webhook.add_embed(discord_embed)
-                                await webhook.execute()
-                                
-                                # YIELD after webhook send
-                                await asyncio.sleep(0)
-                                
-                            except Exception as e:
-                                logger.debug(f"Webhook send failed: {e}")
+                    # Filtering, dedup, permissions and queued delivery
+                    result = await self._notification_service.process_raw_payload(
+                        raw_json, self._gateway_adapter
+                    )
                     
-                    # Parse errors - log with full context
-                    if parse_result.errors:
-                        for error in parse_result.errors:
-                            logger.warning(f"Parse error: {error}")
+                    # Parse and processing errors - log with full context
+                    if result.errors:
+                        for error in result.errors:
+                            logger.warning(f"Processing error: {error}")
                         # Log raw payload at debug level for deeper investigation
                         logger.debug(f"Full payload for failed parse: {raw_json[:2000]}")
                     
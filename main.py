@@ -3,6 +3,7 @@ import asyncio
 import os
 import dotenv
 import logging
+import logging.config
 from logging.handlers import RotatingFileHandler
 import colorlog
 import sys
@@ -20,32 +21,13 @@ args = parser.parse_args()
 
 # Set up logs
 def setup_logger():
-    logger = logging.getLogger()
     if args.verbose:
-        logger.setLevel(logging.DEBUG)
+        root_level = "DEBUG"
     elif args.silent:
         logging.disable()
-        return logger  # Still return the logger object
+        return logging.getLogger()  # Still return the logger object
     else:
-        logger.setLevel(logging.INFO)
-        logging.getLogger("asyncmy").setLevel(logging.ERROR)
-
-    handler = logging.StreamHandler()
-    formatter = colorlog.ColoredFormatter(
-        "%(log_color)s%(asctime)s | %(name)s [%(levelname)s]%(reset)s: %(message)s",
-        datefmt=None,
-        reset=True,
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'blue',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-            },
-        
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+        root_level = "INFO"
 
     noisy_modules = [
         "disnake.gateway",
@@ -62,11 +44,40 @@ def setup_logger():
     ]
 
     # Some modules' debugging logs are really, really... REALLY long (or unnecessary)
-    for module in noisy_modules:
-        mod_logger = logging.getLogger(module)
-        mod_logger.setLevel(logging.WARNING)
+    loggers = {module: {"level": "WARNING"} for module in noisy_modules}
+    if not args.verbose:
+        loggers["asyncmy"] = {"level": "ERROR"}
+
+    # Configure everything in one pass
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "colored": {
+                "()": colorlog.ColoredFormatter,
+                "fmt": "%(log_color)s%(asctime)s | %(name)s [%(levelname)s]%(reset)s: %(message)s",
+                "datefmt": None,
+                "reset": True,
+                "log_colors": {
+                    'DEBUG': 'cyan',
+                    'INFO': 'blue',
+                    'WARNING': 'yellow',
+                    'ERROR': 'red',
+                    'CRITICAL': 'red,bg_white',
+                },
+            },
+        },
+        "handlers": {
+            "colored": {
+                "class": "logging.StreamHandler",
+                "formatter": "colored",
+            },
+        },
+        "loggers": loggers,
+        "root": {"level": root_level, "handlers": ["colored"]},
+    })
 
-    return logger
+    return logging.getLogger()
 setup_logger()
 
 # Get rid of annoying disnake warning (voice support isn't necessary)
@@ -126,7 +137,7 @@ class SolsbotHelper(commands.InteractionBot):
         self.db = Database(db_url)
         self.ws_manager = WebSocketClient(self)
         self.TOKEN = bot_token
-        self.queue = set()
+        self.queue: set[asyncio.Task] = set()
 
 
     async def start(self, *args, **kwargs) -> None:
@@ -209,14 +220,19 @@ class SolsbotHelper(commands.InteractionBot):
         self.logger.warning("Shutting bot down")
         try:
             await self.db.stop()
+            await self.ws_manager.close()
+            
+            # Snapshot background tasks; done callbacks discard from self.queue
+            tasks = list(self.queue)
+            self.queue.clear()
             
             # Cancel and wait for background tasks
-            for task in self.queue:
+            for task in tasks:
                 task.cancel()
             
             # Give cancelled tasks time to finish
-            if self.queue:
-                await asyncio.gather(*self.queue, return_exceptions=True)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
             
             await super().close()
             self.logger.info("Shutdown processed successfully")
@@ -1,14 +1,9 @@
 """User domain models."""
 from tortoise.models import Model
 from tortoise import fields
-from tortoise.signals import post_save
-from typing import TYPE_CHECKING
 
 from .base import TimestampMixin
 
-if TYPE_CHECKING:
-    from typing import Type
-
 
 class User(Model, TimestampMixin):
     """Discord user registered with the bot."""
@@ -49,15 +44,6 @@ class UsernameList(Model, TimestampMixin):
         generated=False
     )
 
+    class Meta:
+        indexes = (("user_id", "name"),)
 
-@post_save(User)
-async def create_aura_list(
-    sender: "Type[User]",
-    instance: User,
-    created: bool,
-    using_db,
-    update_fields
-):
-    """Automatically create an AuraList when a new User is created."""
-    if created:
-        await AuraList.create(user_id=instance)
@@ -1,5 +1,5 @@
 from .user_repository import UserRepository
-from .guild_repository import GuildRepository
+from .guild_repository import GuildRepository, GuildSettingsSnapshot
 from .exceptions import (
     RepositoryError,
     NotFoundError,
@@ -9,6 +9,7 @@ from .exceptions import (
 __all__ = [
     "UserRepository",
     "GuildRepository",
+    "GuildSettingsSnapshot",
     "RepositoryError",
     "NotFoundError", 
     "DuplicateError",
@@ -1,5 +1,8 @@
 """Guild data access."""
 import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional
 
 from models import GuildSettings, User
@@ -9,11 +12,55 @@ from .exceptions import NotFoundError
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class GuildSettingsSnapshot:
+    """Immutable view of the guild settings that gate subscriptions."""
+    allow_posting: bool
+    webhook: str | None
+
+
 class GuildRepository:
     """
     Data access for GuildSettings entity.
     """
     
+    # Short-lived settings cache: guild_id -> (snapshot, expires_at), LRU-bounded
+    _CACHE_TTL: float = 60.0
+    _CACHE_MAX_ENTRIES: int = 4096
+    _settings_cache: OrderedDict[int, tuple[GuildSettingsSnapshot, float]] = OrderedDict()
+    
+    @staticmethod
+    def invalidate(guild_id: int) -> None:
+        """Drop cached settings for a guild."""
+        GuildRepository._settings_cache.pop(guild_id, None)
+    
+    @staticmethod
+    def _get_cached(guild_id: int) -> GuildSettingsSnapshot | None:
+        """Get a cached, unexpired snapshot for a guild."""
+        cache = GuildRepository._settings_cache
+        cached = cache.get(guild_id)
+        if cached is None:
+            return None
+        if cached[1] <= time.monotonic():
+            del cache[guild_id]
+            return None
+        cache.move_to_end(guild_id)
+        return cached[0]
+    
+    @staticmethod
+    def _cache(guild_settings: GuildSettings) -> GuildSettingsSnapshot:
+        """Snapshot guild settings into the cache, evicting the least recently used."""
+        snapshot = GuildSettingsSnapshot(
+            allow_posting=guild_settings.allow_posting,
+            webhook=guild_settings.post_channel_webhook,
+        )
+        cache = GuildRepository._settings_cache
+        cache[guild_settings.guild_id] = (snapshot, time.monotonic() + GuildRepository._CACHE_TTL)
+        cache.move_to_end(guild_settings.guild_id)
+        if len(cache) > GuildRepository._CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return snapshot
+    
     # ============== Guild Settings Operations ==============
     
     @staticmethod
@@ -29,6 +76,19 @@ class GuildRepository:
         """Get guild settings by ID, returns None if not found."""
         return await GuildSettings.filter(guild_id=guild_id).first()
     
+    @staticmethod
+    async def get_policy(guild_id: int, name: str) -> GuildSettingsSnapshot:
+        """
+        Get posting policy for a guild, creating default settings if missing.
+        
+        Served from the settings cache that every setter here invalidates.
+        """
+        snapshot = GuildRepository._get_cached(guild_id)
+        if snapshot is None:
+            guild_settings, _ = await GuildRepository.get_or_create(guild_id, name)
+            snapshot = GuildRepository._cache(guild_settings)
+        return snapshot
+    
     @staticmethod
     async def update_webhook(guild_id: int, webhook_url: str, name: str) -> None:
         """Set or update webhook URL for a guild."""
@@ -38,6 +98,7 @@ class GuildRepository:
         )
         guild_settings.post_channel_webhook = webhook_url
         await guild_settings.save(update_fields=["post_channel_webhook"])
+        GuildRepository.invalidate(guild_id)
     
     @staticmethod
     async def update_role(guild_id: int, role_id: int | None, name: str) -> None:
@@ -48,15 +109,18 @@ class GuildRepository:
         )
         guild_settings.can_post_role = role_id
         await guild_settings.save(update_fields=["can_post_role"])
+        GuildRepository.invalidate(guild_id)
     
     @staticmethod
     async def get_posting_status(guild_id: int, name: str) -> bool:
-        """Check if guild allows posting."""
-        guild_settings, _ = await GuildSettings.get_or_create(
-            guild_id=guild_id,
-            defaults={"name": name}
-        )
-        return guild_settings.allow_posting
+        """Check if guild allows posting (False if guild has no settings yet)."""
+        snapshot = GuildRepository._get_cached(guild_id)
+        if snapshot is None:
+            guild_settings = await GuildRepository.get_by_id(guild_id)
+            if guild_settings is None:
+                return False
+            snapshot = GuildRepository._cache(guild_settings)
+        return snapshot.allow_posting
     
     @staticmethod
     async def set_posting_status(guild_id: int, allow: bool, name: str) -> None:
@@ -67,6 +131,7 @@ class GuildRepository:
         )
         guild_settings.allow_posting = allow
         await guild_settings.save(update_fields=["allow_posting"])
+        GuildRepository.invalidate(guild_id)
     
     @staticmethod
     async def get_webhook_destinations(guild_ids: list[int]) -> list[tuple]:
@@ -84,6 +149,13 @@ class GuildRepository:
             "can_post_role"
         )
     
+    @staticmethod
+    async def get_all_webhooks() -> list[tuple[int, str]]:
+        """Get (guild_id, webhook_url) for every guild with a webhook set."""
+        return await GuildSettings.filter(
+            post_channel_webhook__isnull=False
+        ).values_list("guild_id", "post_channel_webhook")
+    
     @staticmethod
     async def remove_guild_from_users(guild_id: int) -> int:
         """
@@ -2,6 +2,7 @@
 import logging
 from typing import Optional
 from tortoise.exceptions import DoesNotExist
+from tortoise.transactions import in_transaction
 
 from models import User, UsernameList, AuraList
 from .exceptions import NotFoundError, DuplicateError
@@ -17,8 +18,16 @@ class UserRepository:
     
     @staticmethod
     async def get_or_create(user_id: int) -> tuple[User, bool]:
-        """Get existing user or create new one."""
-        return await User.get_or_create(user_id=user_id)
+        """
+        Get existing user or create new one.
+        
+        New users get their AuraList row in the same transaction.
+        """
+        async with in_transaction():
+            user, created = await User.get_or_create(user_id=user_id)
+            if created:
+                await AuraList.create(user_id=user)
+        return user, created
     
     @staticmethod
     async def get_by_id(user_id: int) -> Optional[User]:
@@ -26,18 +35,71 @@ class UserRepository:
         return await User.filter(user_id=user_id).first()
     
     @staticmethod
-    async def get_guilds(user_id: int) -> list[int]:
-        """Get list of guild IDs user is subscribed to."""
-        user, _ = await User.get_or_create(user_id=user_id)
-        return user.guilds if user.guilds else []
+    async def get_guilds_bulk(user_ids: list[int]) -> dict[int, list[int]]:
+        """
+        Get guild subscriptions for many users in one query.
+        
+        Users without a row are omitted from the result.
+        """
+        if not user_ids:
+            return {}
+        rows = await User.filter(user_id__in=user_ids).values_list("user_id", "guilds")
+        return {user_id: guilds or [] for user_id, guilds in rows}
     
     @staticmethod
     async def update_guilds(user_id: int, guilds: list[int]) -> None:
         """Update user's guild subscriptions."""
-        user, _ = await User.get_or_create(user_id=user_id)
+        user, _ = await UserRepository.get_or_create(user_id)
         user.guilds = guilds
         await user.save(update_fields=["guilds"])
     
+    @staticmethod
+    async def subscribe_guild(user_id: int, guild_id: int) -> bool:
+        """
+        Append a guild to user's subscriptions if not already present.
+        
+        Membership check and append run as one UPDATE, so concurrent
+        subscribes cannot both succeed.
+        
+        Returns:
+            True if the guild was added, False if already subscribed
+        """
+        table = User._meta.db_table
+        rows, _ = await User._meta.db.execute_query(
+            f"UPDATE `{table}` "
+            "SET guilds = JSON_ARRAY_APPEND(COALESCE(guilds, JSON_ARRAY()), '$', %s) "
+            "WHERE user_id = %s "
+            "AND NOT JSON_CONTAINS(COALESCE(guilds, JSON_ARRAY()), %s)",
+            # Candidate passed as JSON text; MariaDB has no CAST(... AS JSON)
+            [guild_id, user_id, str(guild_id)],
+        )
+        if rows:
+            return True
+        
+        # Nothing updated: either already subscribed or no user row yet
+        user, created = await UserRepository.get_or_create(user_id)
+        if not created:
+            return False
+        user.guilds = [guild_id]
+        await user.save(update_fields=["guilds"])
+        return True
+    
+    @staticmethod
+    async def unsubscribe_guild(user_id: int, guild_id: int) -> bool:
+        """
+        Remove a guild from user's subscriptions, keeping the order of the rest.
+        
+        Returns:
+            True if the guild was removed, False if not subscribed
+        """
+        async with in_transaction():
+            user = await User.select_for_update().get_or_none(user_id=user_id)
+            if user is None or not user.guilds or guild_id not in user.guilds:
+                return False
+            user.guilds = [g for g in user.guilds if g != guild_id]
+            await user.save(update_fields=["guilds"])
+        return True
+    
     # ============== Username Operations ==============
     
     @staticmethod
@@ -71,7 +133,7 @@ class UserRepository:
         if existing:
             raise DuplicateError("Username", name)
         
-        user, _ = await User.get_or_create(user_id=user_id)
+        user, _ = await UserRepository.get_or_create(user_id)
         return await UsernameList.create(name=name, user_id=user)
     
     @staticmethod
@@ -99,7 +161,7 @@ class UserRepository:
     @staticmethod
     async def get_usernames_for_user(user_id: int) -> list[str]:
         """Get all usernames registered to a user."""
-        user, created = await User.get_or_create(user_id=user_id)
+        user, created = await UserRepository.get_or_create(user_id)
         if created:
             return []
         
@@ -129,7 +191,8 @@ class UserRepository:
     @staticmethod
     async def user_owns_username(user_id: int, name: str) -> bool:
         """Check if a specific user owns a username."""
-        user = await User.filter(user_id=user_id).first()
-        if not user:
-            return False
-        return await UsernameList.filter(name=name, user_id=user).exists()
+        # Names are globally unique, so one lookup on name gives the owner
+        owner_id = await UsernameList.filter(name=name).first().values_list(
+            "user_id_id", flat=True
+        )
+        return owner_id == user_id
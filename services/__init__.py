@@ -16,6 +16,8 @@ from .cache import (
     CircularDeduplicationCache,
 )
 
+from .rate_limit import WebhookBucket
+
 from .validation import (
     WebhookValidationService,
     UsernameValidationService,
@@ -58,6 +60,8 @@ __all__ = [
     # Caches
     "InMemoryUsernameCache",
     "CircularDeduplicationCache",
+    # Rate limiting
+    "WebhookBucket",
     # Validation
     "WebhookValidationService",
     "UsernameValidationService",
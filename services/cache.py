@@ -3,70 +3,101 @@ Cache Implementations
 
 Concrete implementations of cache protocols.
 """
-import hashlib
-from collections import deque
+import time
+from collections import OrderedDict
 from typing import Callable, Awaitable
 
-from .protocols import UsernameCache, DeduplicationCache
+from .protocols import UsernameCache, DeduplicationCache, LoweredUsername
 from .config import DeduplicationConfig
 
 
 class InMemoryUsernameCache:
-    """Thread-safe in-memory username cache."""
+    """
+    Thread-safe in-memory username cache.
+    
+    Reads go through an immutable frozenset snapshot that is swapped in
+    whole on every mutation, so lookups never see a half-updated set.
+    """
+    
+    __slots__ = ("_usernames", "_snapshot", "_db_loader")
     
     def __init__(self, db_loader: Callable[[], Awaitable[list[str]]] | None = None):
         self._usernames: set[str] = set()
+        self._snapshot: frozenset[str] = frozenset()
         self._db_loader = db_loader
     
-    def contains(self, username: str) -> bool:
-        return username.lower() in self._usernames
+    # Callers pass already-lowercased names; only DB loads are normalized here
+    
+    def __contains__(self, username: LoweredUsername) -> bool:
+        return username in self._snapshot
     
-    def add(self, username: str) -> None:
-        self._usernames.add(username.lower())
+    def contains(self, username: LoweredUsername) -> bool:
+        return username in self._snapshot
     
-    def remove(self, username: str) -> None:
-        self._usernames.discard(username.lower())
+    def add(self, username: LoweredUsername) -> None:
+        self._usernames.add(username)
+        self._snapshot = frozenset(self._usernames)
+    
+    def remove(self, username: LoweredUsername) -> None:
+        self._usernames.discard(username)
+        self._snapshot = frozenset(self._usernames)
     
     def as_set(self) -> frozenset[str]:
-        return frozenset(self._usernames)
+        return self._snapshot
     
     async def refresh_from_db(self) -> None:
         if self._db_loader:
             usernames = await self._db_loader()
             self._usernames = set(u.lower() for u in usernames)
+            self._snapshot = frozenset(self._usernames)
     
     def __len__(self) -> int:
-        return len(self._usernames)
+        return len(self._snapshot)
 
 
 class CircularDeduplicationCache:
-    """Circular buffer-based deduplication cache."""
+    """FIFO-bounded deduplication cache with optional TTL."""
+    
+    __slots__ = ("_config", "_seen")
     
     def __init__(self, config: DeduplicationConfig | None = None):
         self._config = config or DeduplicationConfig()
-        self._hashes: deque[str] = deque(maxlen=self._config.window_size)
-        self._hash_set: set[str] = set()
+        # hash -> recorded_at, in insertion order; oldest first
+        self._seen: OrderedDict[bytes, float] = OrderedDict()
     
-    def is_duplicate(self, notification_hash: str) -> bool:
-        return notification_hash in self._hash_set
+    def is_duplicate(self, notification_hash: bytes) -> bool:
+        recorded_at = self._seen.get(notification_hash)
+        if recorded_at is None:
+            return False
+        ttl = self._config.ttl_seconds
+        return ttl is None or time.monotonic() - recorded_at < ttl
     
-    def record(self, notification_hash: str) -> None:
-        if len(self._hashes) >= self._config.window_size:
-            oldest = self._hashes[0]
-            self._hash_set.discard(oldest)
+    def record(self, notification_hash: bytes) -> None:
+        now = time.monotonic()
+        seen = self._seen
+        # Re-recording moves the hash to the back with a fresh timestamp
+        seen.pop(notification_hash, None)
         
-        self._hashes.append(notification_hash)
-        self._hash_set.add(notification_hash)
+        if self._config.ttl_seconds is not None:
+            self._purge_expired(now)
+        
+        if len(seen) >= self._config.window_size:
+            seen.popitem(last=False)
+        
+        seen[notification_hash] = now
     
-    def clear(self) -> None:
-        self._hashes.clear()
-        self._hash_set.clear()
+    def _purge_expired(self, now: float) -> None:
+        """Drop hashes older than the TTL from the front of the cache."""
+        cutoff = now - self._config.ttl_seconds
+        seen = self._seen
+        while seen:
+            oldest = next(iter(seen))
+            if seen[oldest] > cutoff:
+                break
+            del seen[oldest]
     
-    @staticmethod
-    def generate_hash(name: str, aura: str, timestamp: str) -> str:
-        """Generate notification hash from key fields."""
-        key = f"{name}:{aura}:{timestamp}"
-        return hashlib.md5(key.encode()).hexdigest()
+    def clear(self) -> None:
+        self._seen.clear()
     
     def __len__(self) -> int:
-        return len(self._hashes)
+        return len(self._seen)
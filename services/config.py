@@ -1,9 +1,10 @@
 """Service layer configuration."""
 from dataclasses import dataclass, field
+from functools import lru_cache
 import os
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WebSocketConfig:
     """WebSocket connection and retry configuration."""
     uri: str = "wss://api.mongoosee.com/solsstattracker/v2/gateway"
@@ -21,37 +22,54 @@ class WebSocketConfig:
     # Connection health
     close_timeout: float = 10.0
     zombie_timeout: float = 60.0
+    
+    # Largest frame accepted; must stay above PayloadParsingService.STREAM_THRESHOLD
+    # so oversized payloads reach the streaming parser instead of closing the socket
+    max_message_size: int = 8 * 1024 * 1024
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QueueConfig:
     """Notification queue configuration."""
     max_size: int = 1000
     drop_strategy: str = "oldest"  # "oldest" or "newest"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationConfig:
     """Notification processing configuration."""
     exceptional_rarity_threshold: int = 750_000_000
     global_icon_url: str = "https://cdn.mongoosee.com/assets/stars/Global.png"
     exceptional_message: str = "Good find!"
+    max_concurrent_deliveries: int = 10  # Webhooks sent in parallel per batch
+    
+    # Per-webhook client-side rate limit (Discord allows 5 requests / 2s per webhook)
+    webhook_rate_per_second: float = 2.5
+    webhook_burst: int = 5
+    max_delivery_retries: int = 3  # Retries after a 429 response
+    delivery_timeout: float = 10.0  # Seconds before a webhook request is abandoned
+    
+    # Notifications to the same webhook within this window share one request
+    coalesce_window: float = 1.0
+    max_embeds_per_message: int = 10  # Discord's per-message embed limit
+    max_embed_chars_per_message: int = 6000  # Discord's total text limit across embeds
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DeduplicationConfig:
     """Duplicate detection configuration."""
     window_size: int = 100  # Number of recent hashes to track
+    ttl_seconds: float | None = None  # Forget hashes older than this (None = window only)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CacheConfig:
     """Cache TTL and size configuration."""
     permission_cache_ttl: int = 300  # 5 minutes
     permission_cache_size: int = 1000
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValidationConfig:
     """Input validation constraints."""
     username_max_length: int = 20
@@ -59,7 +77,7 @@ class ValidationConfig:
     webhook_valid_domains: tuple[str, ...] = ("discord.com", "discordapp.com")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServiceConfig:
     """Root configuration container for all services."""
     websocket: WebSocketConfig = field(default_factory=WebSocketConfig)
@@ -71,25 +89,40 @@ class ServiceConfig:
     
     @classmethod
     def from_environment(cls) -> "ServiceConfig":
-        """Load configuration with environment variable overrides."""
-        return cls(
-            websocket=WebSocketConfig(
-                uri=os.getenv(
-                    "SOLS_API_URI", 
-                    "wss://api.mongoosee.com/solsstattracker/v2/gateway"
-                ),
-                zombie_timeout=float(os.getenv("WS_ZOMBIE_TIMEOUT", "60")),
-            ),
-            queue=QueueConfig(
-                max_size=int(os.getenv("QUEUE_MAX_SIZE", "1000")),
+        """
+        Load configuration with environment variable overrides.
+        
+        The environment is read once; later calls return the same instance.
+        """
+        return _load_config()
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget the loaded configuration so the next load re-reads the environment."""
+        _load_config.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _load_config() -> ServiceConfig:
+    """Build ServiceConfig from environment variables."""
+    return ServiceConfig(
+        websocket=WebSocketConfig(
+            uri=os.getenv(
+                "SOLS_API_URI", 
+                "wss://api.mongoosee.com/solsstattracker/v2/gateway"
             ),
-            notification=NotificationConfig(
-                exceptional_rarity_threshold=int(
-                    os.getenv("EXCEPTIONAL_RARITY", "750000000")
-                ),
+            zombie_timeout=float(os.getenv("WS_ZOMBIE_TIMEOUT", "60")),
+            max_message_size=int(os.getenv("WS_MAX_MESSAGE_SIZE", str(8 * 1024 * 1024))),
+        ),
+        queue=QueueConfig(
+            max_size=int(os.getenv("QUEUE_MAX_SIZE", "1000")),
+        ),
+        notification=NotificationConfig(
+            exceptional_rarity_threshold=int(
+                os.getenv("EXCEPTIONAL_RARITY", "750000000")
             ),
-        )
-
+        ),
+    )
 
 # Global default configuration
 default_config = ServiceConfig()
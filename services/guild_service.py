@@ -1,20 +1,61 @@
 """Guild business logic."""
 import logging
+from functools import lru_cache
 from repositories import GuildRepository
 from models import GuildSettings, User
+from .config import ServiceConfig
+from .validation import WebhookValidationService
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_webhook_validator() -> WebhookValidationService:
+    """Shared validator, built on first use from the service configuration."""
+    return WebhookValidationService(ServiceConfig.from_environment().validation)
+
+
 class GuildService:
     """
     Business logic for guild-related operations.
     """
     
+    # Guilds whose stored webhook failed validation at startup; skipped on delivery
+    _invalid_webhook_guilds: set[int] = set()
+    
     @staticmethod
     async def add_webhook(guild_id: int, webhook_url: str, guild_name: str) -> None:
-        """Set webhook URL for a guild."""
+        """
+        Set webhook URL for a guild.
+        
+        Raises:
+            ValidationError: If the URL is not a valid Discord webhook
+        """
+        _get_webhook_validator().validate(webhook_url)
         await GuildRepository.update_webhook(guild_id, webhook_url, guild_name)
+        GuildService._invalid_webhook_guilds.discard(guild_id)
+    
+    @staticmethod
+    async def report_invalid_webhooks() -> list[int]:
+        """
+        Log stored webhooks that fail validation.
+        
+        Rows are left untouched; get_user_destinations skips these guilds until
+        add_webhook stores a valid URL for them.
+        
+        Returns:
+            Guild IDs with an invalid webhook
+        """
+        validator = _get_webhook_validator()
+        invalid = [
+            guild_id
+            for guild_id, url in await GuildRepository.get_all_webhooks()
+            if not validator.is_valid(url)
+        ]
+        GuildService._invalid_webhook_guilds = set(invalid)
+        if invalid:
+            logger.warning(f"Guilds with invalid stored webhooks (skipped on delivery): {invalid}")
+        return invalid
     
     @staticmethod
     async def add_role(guild_id: int, role_id: int, guild_name: str) -> None:
@@ -70,4 +111,9 @@ class GuildService:
             return [], user.user_id
         
         webhooks = await GuildRepository.get_webhook_destinations(guild_ids)
+        
+        # Skip guilds whose webhook was stored before write-time validation
+        invalid = GuildService._invalid_webhook_guilds
+        if invalid:
+            webhooks = [row for row in webhooks if row[1] not in invalid]
         return webhooks, user.user_id
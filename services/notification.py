@@ -1,37 +1,83 @@
 """Notification processing and delivery."""
+import asyncio
+import hashlib
+import json
 import logging
 from dataclasses import dataclass
 from typing import Any
 
-from discord_webhook import AsyncDiscordWebhook, DiscordEmbed
+import aiohttp
+from discord_webhook import DiscordEmbed
 
 from .protocols import (
     ParsedEmbed,
     UsernameCache,
     DeduplicationCache,
     WebhookTarget,
-    DeliveryResult,
 )
 from .parsing import PayloadParsingService
 from .permission import PermissionService
-from .validation import WebhookValidationService
+from .rate_limit import WebhookBucket, retry_delay
 from .config import NotificationConfig
-from .exceptions import NotFoundError
+from .exceptions import NotFoundError, RateLimitError
+from repositories.exceptions import NotFoundError as RepositoryNotFoundError
 
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ProcessingResult:
     """Result of processing a raw notification payload."""
     processed_count: int
     skipped_duplicates: int
     skipped_no_destinations: int
-    delivery_results: list[DeliveryResult]
+    queued_deliveries: int  # Sent in the background by the flusher
     errors: list[str]
 
 
+@dataclass(frozen=True, slots=True)
+class _PendingDelivery:
+    """A notification waiting to be coalesced into a webhook request."""
+    embed_json: bytes
+    embed_chars: int
+    content: str | None
+    target: WebhookTarget
+
+
+_blake2b = hashlib.blake2b
+
+
+def _hash_embed(embed: ParsedEmbed) -> bytes:
+    """Generate 64-bit deduplication hash for embed."""
+    h = _blake2b(digest_size=8)
+    h.update(embed.name.encode())
+    h.update(b"\x1f")
+    h.update(embed.aura.encode())
+    h.update(b"\x1f")
+    h.update(embed.timestamp.encode())
+    return h.digest()
+
+
+def _embed_chars(embed: DiscordEmbed) -> int:
+    """Count the characters Discord sums toward its per-message embed limit."""
+    total = len(embed.title or "") + len(embed.description or "")
+    if embed.author:
+        total += len(embed.author.get("name") or "")
+    if embed.footer:
+        total += len(embed.footer.get("text") or "")
+    for field in embed.fields or ():
+        total += len(field["name"]) + len(field["value"])
+    return total
+
+
 class NotificationService:
     """Processes and routes notifications to webhooks."""
     
@@ -40,7 +86,6 @@ class NotificationService:
         username_cache: UsernameCache,
         dedup_cache: DeduplicationCache,
         permission_service: PermissionService,
-        webhook_validator: WebhookValidationService,
         destination_loader,  # Callable to load destinations from DB
         config: NotificationConfig | None = None,
         bot_avatar_url: str | None = None,
@@ -48,42 +93,48 @@ class NotificationService:
         self._usernames = username_cache
         self._dedup = dedup_cache
         self._permissions = permission_service
-        self._webhook_validator = webhook_validator
         self._load_destinations = destination_loader
         self._config = config or NotificationConfig()
         self._bot_avatar_url = bot_avatar_url
         
         self._parser = PayloadParsingService()
+        self._delivery_semaphore = asyncio.Semaphore(self._config.max_concurrent_deliveries)
+        self._buckets: dict[str, WebhookBucket] = {}
+        self._session: aiohttp.ClientSession | None = None  # Created on first delivery
+        
+        # Per-URL coalescing queue, drained by a background flusher
+        self._coalesce: dict[str, list[_PendingDelivery]] = {}
+        self._flush_locks: dict[str, asyncio.Lock] = {}
+        self._flusher_task: asyncio.Task | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+    
+    def set_bot_avatar_url(self, url: str | None) -> None:
+        """Set the avatar shown on outgoing webhook messages."""
+        self._bot_avatar_url = url
     
     async def process_raw_payload(
         self,
-        raw_json: str,
+        raw_json: str | bytes,
         discord_gateway: Any = None,  # For user lookups
     ) -> ProcessingResult:
         """
         Process a raw WebSocket payload end-to-end.
         
         Args:
-            raw_json: Raw JSON string from WebSocket
+            raw_json: Raw JSON text or bytes from WebSocket
             discord_gateway: Discord client for user lookups
             
         Returns:
             ProcessingResult with statistics and any errors
         """
-        result = ProcessingResult(
-            processed_count=0,
-            skipped_duplicates=0,
-            skipped_no_destinations=0,
-            delivery_results=[],
-            errors=[],
-        )
+        processed_count = 0
+        skipped_duplicates = 0
+        skipped_no_destinations = 0
+        queued_deliveries = 0
         
         # Parse payload
         parse_result = self._parser.parse_raw_message(raw_json)
-        result.errors.extend(parse_result.errors)
-        
-        if not parse_result.embeds:
-            return result
+        errors = list(parse_result.errors)
         
         # Process each embed
         for embed in parse_result.embeds:
@@ -91,26 +142,32 @@ class NotificationService:
                 embed_result = await self._process_single_embed(embed, discord_gateway)
                 
                 if embed_result == "duplicate":
-                    result.skipped_duplicates += 1
+                    skipped_duplicates += 1
                 elif embed_result == "no_match":
                     pass  # Not tracked, expected
                 elif embed_result == "no_destinations":
-                    result.skipped_no_destinations += 1
+                    skipped_no_destinations += 1
                 elif isinstance(embed_result, list):
-                    result.processed_count += 1
-                    result.delivery_results.extend(embed_result)
+                    processed_count += 1
+                    queued_deliveries += len(embed_result)
                     
             except Exception as e:
-                result.errors.append(f"Embed '{embed.name}': {e}")
+                errors.append(f"Embed '{embed.name}': {e}")
                 logger.exception(f"Error processing embed for {embed.name}")
         
-        return result
+        return ProcessingResult(
+            processed_count=processed_count,
+            skipped_duplicates=skipped_duplicates,
+            skipped_no_destinations=skipped_no_destinations,
+            queued_deliveries=queued_deliveries,
+            errors=errors,
+        )
     
     async def _process_single_embed(
         self,
         embed: ParsedEmbed,
         discord_gateway: Any,
-    ) -> str | list[DeliveryResult]:
+    ) -> str | list[WebhookTarget]:
         """
         Process a single parsed embed.
         
@@ -118,14 +175,14 @@ class NotificationService:
             "duplicate" - Already processed
             "no_match" - Username not tracked
             "no_destinations" - No valid delivery targets
-            List[DeliveryResult] - Delivery results
+            List[WebhookTarget] - Targets queued for delivery
         """
         # Check if username is tracked
-        if not self._usernames.contains(embed.name):
+        if embed.name not in self._usernames:
             return "no_match"
         
         # Check for duplicate
-        notification_hash = self._generate_hash(embed)
+        notification_hash = _hash_embed(embed)
         if self._dedup.is_duplicate(notification_hash):
             logger.debug(f"Skipping duplicate notification for '{embed.name}'")
             return "duplicate"
@@ -136,8 +193,8 @@ class NotificationService:
         # Load destinations
         try:
             destinations = await self._load_destinations(embed.name)
-        except NotFoundError:
-            logger.warning(f"Username '{embed.name}' no longer exists")
+        except (NotFoundError, RepositoryNotFoundError):
+            logger.debug(f"Username '{embed.name}' no longer exists")
             return "no_destinations"
         
         if not destinations:
@@ -149,18 +206,15 @@ class NotificationService:
         if not webhooks:
             return "no_destinations"
         
-        # Filter by permissions and validate URLs
+        # Check all permissions up front (one member lookup per guild)
+        permitted = await self._permissions.check_user_permissions_batch(
+            [(guild_id, user_id, required_role_id) for _, guild_id, required_role_id in webhooks]
+        )
+        
+        # Filter by permissions (invalid URLs were dropped when loaded)
         valid_targets: list[WebhookTarget] = []
-        for url, guild_id, required_role_id in webhooks:
-            # Check permission
-            if not await self._permissions.check_user_permission(
-                guild_id, user_id, required_role_id
-            ):
-                continue
-            
-            # Validate webhook URL
-            if not self._webhook_validator.is_valid(url):
-                logger.warning(f"Skipping invalid webhook for guild {guild_id}")
+        for (url, guild_id, _), allowed in zip(webhooks, permitted):
+            if not allowed or not url:
                 continue
             
             valid_targets.append(WebhookTarget(
@@ -178,16 +232,13 @@ class NotificationService:
         # Determine if exceptional find
         content = self._get_content_message(embed)
         
-        # Deliver to all targets
-        results = await self._deliver_batch(valid_targets, discord_embed, content)
+        # Serialize the embed once, every target receives the same bytes
+        embed_json = _dumps(discord_embed.__dict__)
         
-        return results
-    
-    def _generate_hash(self, embed: ParsedEmbed) -> str:
-        """Generate deduplication hash for embed."""
-        import hashlib
-        key = f"{embed.name}:{embed.aura}:{embed.timestamp}"
-        return hashlib.md5(key.encode()).hexdigest()
+        # Queue for all targets; the flusher sends without blocking this payload
+        self._enqueue(valid_targets, embed_json, _embed_chars(discord_embed), content)
+        
+        return valid_targets
     
     def _build_discord_embed(
         self,
@@ -239,46 +290,170 @@ class NotificationService:
     
     def _get_content_message(self, embed: ParsedEmbed) -> str | None:
         """Determine if notification deserves special message."""
-        rarity_value = self._parser.parse_rarity_value(embed.rarity, embed.description)
-        
         is_exceptional = (
-            rarity_value >= self._config.exceptional_rarity_threshold
+            embed.rarity_int >= self._config.exceptional_rarity_threshold
             or embed.icon_url != self._config.global_icon_url
         )
         
         return self._config.exceptional_message if is_exceptional else None
     
-    async def _deliver_batch(
+    def _build_payload(self, content: str | None, embed_jsons: list[bytes]) -> bytes:
+        """Assemble a webhook request body from pre-serialized embeds."""
+        head: dict[str, Any] = {"username": "Solsbot Helper"}
+        if content:
+            head["content"] = content
+        if self._bot_avatar_url:
+            head["avatar_url"] = self._bot_avatar_url
+        
+        return _dumps(head)[:-1] + b',"embeds":[' + b",".join(embed_jsons) + b"]}"
+    
+    def _enqueue(
         self,
         targets: list[WebhookTarget],
-        embed: DiscordEmbed,
+        embed_json: bytes,
+        embed_chars: int,
         content: str | None,
-    ) -> list[DeliveryResult]:
-        """Deliver notification to multiple webhooks sequentially."""
-        results: list[DeliveryResult] = []
+    ) -> None:
+        """
+        Queue notification for each target without waiting for delivery.
+        
+        Notifications for the same URL within one flush window are sent
+        together, within Discord's per-message embed and character limits.
+        """
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flusher())
         
         for target in targets:
-            try:
-                webhook = AsyncDiscordWebhook(
-                    url=target.url,
-                    content=content,
-                    username="Solsbot Helper",
-                    avatar_url=self._bot_avatar_url,
+            self._coalesce.setdefault(target.url, []).append(
+                _PendingDelivery(embed_json, embed_chars, content, target)
+            )
+    
+    async def _flusher(self) -> None:
+        """Periodically hand queued notifications off for delivery."""
+        while True:
+            await asyncio.sleep(self._config.coalesce_window)
+            if not self._coalesce:
+                continue
+            
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60),
+                    timeout=aiohttp.ClientTimeout(total=self._config.delivery_timeout),
                 )
-                webhook.add_embed(embed)
-                await webhook.execute()
+            
+            pending, self._coalesce = self._coalesce, {}
+            for url, items in pending.items():
+                task = asyncio.create_task(self._flush_url(url, items))
+                self._flush_tasks.add(task)
+                task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _flush_url(self, url: str, items: list[_PendingDelivery]) -> None:
+        """Send queued notifications for one URL in order, batching embeds."""
+        lock = self._flush_locks.get(url)
+        if lock is None:
+            lock = self._flush_locks[url] = asyncio.Lock()
+        
+        # Lock keeps per-URL ordering when a previous flush is still sending
+        async with lock:
+            chunk: list[_PendingDelivery] = []
+            chunk_chars = 0
+            for item in items:
+                if chunk and (
+                    len(chunk) >= self._config.max_embeds_per_message
+                    or chunk_chars + item.embed_chars > self._config.max_embed_chars_per_message
+                    or item.content != chunk[0].content
+                ):
+                    await self._send_chunk(url, chunk)
+                    chunk = []
+                    chunk_chars = 0
+                chunk.append(item)
+                chunk_chars += item.embed_chars
+            
+            if chunk:
+                await self._send_chunk(url, chunk)
+    
+    async def _send_chunk(self, url: str, chunk: list[_PendingDelivery]) -> None:
+        """Send one webhook request and report a failed delivery."""
+        guild_id = chunk[0].target.guild_id
+        payload = self._build_payload(chunk[0].content, [item.embed_json for item in chunk])
+        success, error = await self._send_one(url, payload, guild_id)
+        
+        if not success:
+            logger.warning(f"Failed to deliver {len(chunk)} notification(s) to guild {guild_id}: {error}")
+    
+    async def _send_one(
+        self,
+        url: str,
+        payload: bytes,
+        guild_id: int,
+    ) -> tuple[bool, str | None]:
+        """Send a request to a single webhook, honouring rate limits."""
+        bucket = self._get_bucket(url)
+        retries = self._config.max_delivery_retries
+        
+        try:
+            for attempt in range(retries + 1):
+                await bucket.acquire()
                 
-                results.append(DeliveryResult(
-                    target=target,
-                    success=True,
-                ))
-                    
-            except Exception as e:
-                logger.debug(f"Delivery failed for {target.guild_id}: {e}")
-                results.append(DeliveryResult(
-                    target=target,
-                    success=False,
-                    error=str(e),
-                ))
-        
-        return results
+                # Only the request itself occupies a delivery slot, never rate limit waits
+                async with self._delivery_semaphore:
+                    async with self._session.post(
+                        url,
+                        data=payload,
+                        headers={"Content-Type": "application/json"},
+                    ) as response:
+                        bucket.update_from_headers(response.headers)
+                        
+                        if response.status != 429:
+                            if response.status < 400:
+                                return True, None
+                            return False, f"HTTP {response.status}"
+                        
+                        try:
+                            body = await response.json(content_type=None)
+                        except Exception:
+                            body = None
+                
+                delay = retry_delay(response.headers, body, attempt)
+                if attempt == retries:
+                    raise RateLimitError(f"webhook for guild {guild_id}", delay)
+                
+                logger.debug(f"Rate limited on guild {guild_id}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                
+        except Exception as e:
+            logger.debug(f"Delivery failed for {guild_id}: {e!r}")
+            return False, str(e) or type(e).__name__
+        
+        return False, "No delivery attempts made"
+    
+    def _get_bucket(self, url: str) -> WebhookBucket:
+        """Get or create the rate limit bucket for a webhook URL."""
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            bucket = self._buckets[url] = WebhookBucket(
+                rate=self._config.webhook_rate_per_second,
+                burst=self._config.webhook_burst,
+            )
+        return bucket
+    
+    async def close(self) -> None:
+        """Stop the flusher and release the shared HTTP session."""
+        tasks = list(self._flush_tasks)
+        if self._flusher_task is not None:
+            tasks.append(self._flusher_task)
+            self._flusher_task = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Anything still queued will never be sent
+        dropped = sum(len(items) for items in self._coalesce.values())
+        if dropped:
+            logger.warning(f"Dropping {dropped} queued notification(s) on shutdown")
+        self._coalesce.clear()
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -3,15 +3,41 @@ import json
 import re
 import logging
 from dataclasses import dataclass
+from io import BytesIO
+from functools import lru_cache
 
 from .protocols import ParsedEmbed
 from .exceptions import ValidationError
 
+try:
+    import orjson
+    _loads = orjson.loads  # Accepts bytes directly, raises a json.JSONDecodeError subclass
+except ImportError:
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 logger = logging.getLogger(__name__)
 
+# Patterns used on the per-embed parse path, compiled once at import
+_BRACKET_RE = re.compile(r'\[([^\]]+)\]')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+# The number (digits, commas, spaces) must run up to "**" or the end, so "825.5M" never yields 825
+_RARITY_RE = re.compile(r'\b1\s*in\s*(\d[\d, ]*?)\s*(?:\*\*|\Z)', re.IGNORECASE)
+# Normal format: **Player** ... **AuraName** ... **1 in X**
+# Segments are any text without "**" (single "*" allowed), same as splitting on "**";
+# the rarity segment is not format-checked so odd rarity text never loses the aura
+_NO_BOLD = r'(?:[^*]|\*(?!\*))*'
+_BOLD_PAIR_RE = re.compile(
+    rf'{_NO_BOLD}\*\*{_NO_BOLD}\*\*{_NO_BOLD}\*\*({_NO_BOLD})\*\*{_NO_BOLD}\*\*({_NO_BOLD})'
+)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParseResult:
     """Result of parsing a raw payload."""
     embeds: list[ParsedEmbed]
@@ -24,12 +50,16 @@ class PayloadParsingService:
     # Regex for extracting username from author name: "DisplayName(@username)"
     USERNAME_PATTERN = re.compile(r'\(([^)]+)\)')
     
-    def parse_raw_message(self, raw_json: str) -> ParseResult:
+    # Payloads larger than this are stream-parsed (data.embeds only) when ijson is available.
+    # WebSocketConfig.max_message_size must exceed it or such frames never arrive.
+    STREAM_THRESHOLD = 1024 * 1024
+    
+    def parse_raw_message(self, raw_json: str | bytes) -> ParseResult:
         """
         Parse raw JSON message from WebSocket.
         
         Args:
-            raw_json: Raw JSON string from API
+            raw_json: Raw JSON text or bytes from API
             
         Returns:
             ParseResult with successfully parsed embeds and any errors
@@ -37,9 +67,12 @@ class PayloadParsingService:
         errors: list[str] = []
         embeds: list[ParsedEmbed] = []
         
+        if ijson is not None and len(raw_json) > self.STREAM_THRESHOLD:
+            return self._parse_streaming(raw_json)
+        
         # Parse JSON
         try:
-            payload = json.loads(raw_json)
+            payload = _loads(raw_json)
         except json.JSONDecodeError as e:
             return ParseResult(embeds=[], errors=[f"Invalid JSON: {e}"])
         
@@ -50,6 +83,47 @@ class PayloadParsingService:
             return ParseResult(embeds=[], errors=[f"Missing payload structure: {e}"])
         
         # Parse each embed
+        self._parse_embeds(raw_embeds, embeds, errors)
+        
+        return ParseResult(embeds=embeds, errors=errors)
+    
+    def _parse_streaming(self, raw_json: str | bytes) -> ParseResult:
+        """
+        Parse only the data.embeds array of a large payload.
+        
+        Embeds are decoded one at a time, so the rest of the payload is
+        never materialized as Python objects.
+        """
+        errors: list[str] = []
+        embeds: list[ParsedEmbed] = []
+        
+        if isinstance(raw_json, str):
+            raw_json = raw_json.encode()
+        
+        found_embeds = False
+        
+        def track_embeds(events):
+            # Notes whether data.embeds exists, to match the in-memory path's error
+            nonlocal found_embeds
+            for prefix, event, value in events:
+                if prefix == "data.embeds" and event == "start_array":
+                    found_embeds = True
+                yield prefix, event, value
+        
+        events = ijson.parse(BytesIO(raw_json), use_float=True)
+        raw_embeds = ijson.items(track_embeds(events), "data.embeds.item")
+        try:
+            self._parse_embeds(raw_embeds, embeds, errors)
+        except ijson.JSONError as e:
+            return ParseResult(embeds=embeds, errors=errors + [f"Invalid JSON: {e}"])
+        
+        if not found_embeds:
+            return ParseResult(embeds=[], errors=["Missing payload structure: 'embeds'"])
+        
+        return ParseResult(embeds=embeds, errors=errors)
+    
+    def _parse_embeds(self, raw_embeds, embeds: list[ParsedEmbed], errors: list[str]) -> None:
+        """Parse each raw embed, collecting results and per-embed errors."""
         for i, raw_embed in enumerate(raw_embeds):
             try:
                 parsed = self._parse_single_embed(raw_embed)
@@ -59,8 +133,6 @@ class PayloadParsingService:
                 raw_preview = str(raw_embed)[:500]
                 errors.append(f"Embed {i}: {e}\n  Raw data: {raw_preview}")
                 continue
-        
-        return ParseResult(embeds=embeds, errors=errors)
     
     def _parse_single_embed(self, embed: dict) -> ParsedEmbed:
         """Parse a single embed dict into structured data."""
@@ -77,28 +149,46 @@ class PayloadParsingService:
         # Get description
         description = embed.get("description", "")
         
-        # Build field lookup by name (case-insensitive)
-        fields = embed.get("fields", [])
-        field_map = {f.get("name", "").lower(): f.get("value", "?") for f in fields}
+        # Pick known fields by name (case-insensitive), stopping once all are found
+        rolls = luck = time = rarity_field = time_fallback = None
+        for f in embed.get("fields", []):
+            key = f.get("name", "").lower()
+            if key == "rolls":
+                rolls = f.get("value", "?")
+            elif key == "luck":
+                luck = f.get("value", "?")
+            elif key == "time discovered":
+                time = f.get("value", "?")
+            elif key == "time":
+                time_fallback = f.get("value", "?")
+            elif key == "rarity":
+                rarity_field = f.get("value", "?")
+            else:
+                continue
+            if rolls is not None and luck is not None and time is not None and rarity_field is not None:
+                break
         
         # Detect format: rare auras have separate Rarity field, normal have CHANCE in description
-        has_rarity_field = "rarity" in field_map
+        has_rarity_field = rarity_field is not None
         is_rare_format = has_rarity_field or "CHANCE" not in description.upper()
         
         # Extract aura name based on format
         if is_rare_format:
             # Rare format: "has become the **[Frozen Sovereign]**"
             aura = self._extract_aura_rare(description)
-            rarity = field_map.get("rarity")  # Keep as separate field value
+            rarity = rarity_field  # Keep as separate field value
         else:
             # Normal format: "HAS FOUND **AURA**, CHANCE OF **1 in X**"
             aura, _ = self._extract_aura_rarity(description)
             rarity = None  # Rarity is in description, not separate
         
-        # Extract required fields by name
-        rolls = field_map.get("rolls", "?")
-        luck = field_map.get("luck", "?")
-        time = field_map.get("time discovered", field_map.get("time", "?"))
+        # Fill defaults for missing fields
+        if rolls is None:
+            rolls = "?"
+        if luck is None:
+            luck = "?"
+        if time is None:
+            time = time_fallback if time_fallback is not None else "?"
         
         return ParsedEmbed(
             name=name,
@@ -114,6 +204,7 @@ class PayloadParsingService:
             timestamp=embed.get("timestamp", ""),
             color=embed.get("color", 0),
             is_rare_format=is_rare_format,
+            rarity_int=self.parse_rarity_value(rarity, description),
         )
     
     def _extract_aura_rare(self, description: str) -> str:
@@ -125,15 +216,13 @@ class PayloadParsingService:
         """
         try:
             # Try to find text in brackets first [AuraName]
-            import re
-            bracket_match = re.search(r'\[([^\]]+)\]', description)
+            bracket_match = _BRACKET_RE.search(description)
             if bracket_match:
                 return bracket_match.group(1)
             
             # Try to find bold text (between **) that looks like an aura name
-            parts = description.split("**")
-            for part in parts[1:]:  # Skip first part (before any bold)
-                part = part.strip()
+            for bold_match in _BOLD_RE.finditer(description):
+                part = bold_match.group(1).strip()
                 # Skip if it's the username, empty, or looks like rarity
                 if not part or "@" in part or part.startswith("1 in") or part.startswith(">"):
                     continue
@@ -153,36 +242,22 @@ class PayloadParsingService:
         
         Format: "DisplayName (@username)" or "DisplayName (username)"
         """
-        match = self.USERNAME_PATTERN.search(author_name)
-        if match:
-            name = match.group(1)
-        else:
-            name = author_name
-        
-        # Remove @ prefix if present, lowercase for consistency
-        return name.replace("@", "").lower()
+        return _extract_username(author_name)
     
     def _extract_aura_rarity(self, description: str) -> tuple[str, str]:
         """
         Extract aura name and rarity from description.
         
-        Expected format uses bold markdown: **AuraName** ... **1 in X**
+        Expected format uses bold markdown: **Player** ... **AuraName** ... **1 in X**
         """
-        try:
-            parts = description.split("**")
-            if len(parts) < 6:
-                raise ValueError(
-                    f"Expected 6+ bold sections, got {len(parts)}. "
-                    f"Parts: {parts[:8]}"  # Show first 8 for context
-                )
-            aura = parts[3]
-            rarity = parts[5][5:]  # Skip "1 in " prefix
-            return aura, rarity
-        except IndexError as e:
+        match = _BOLD_PAIR_RE.match(description)
+        if not match:
             raise ValueError(
-                f"Could not parse aura/rarity (index error: {e}). "
+                "Could not parse aura/rarity. "
                 f"Description: {description[:200]}..."
             )
+        aura, rarity = match.groups()
+        return aura, rarity.strip()
     
     def parse_rarity_value(self, rarity_str: str | None, description: str | None = None) -> int:
         """
@@ -192,24 +267,42 @@ class PayloadParsingService:
         """
         # If no direct rarity, try to extract from description
         if rarity_str is None and description:
-            try:
-                # Look for pattern like "1 in X" or "1 IN X"
-                parts = description.upper().split("1 IN ")
-                if len(parts) >= 2:
-                    # Get the number part after "1 in "
-                    rarity_part = parts[-1].split("**")[0].strip()
-                    rarity_str = rarity_part
-            except Exception:
-                return 0
+            # Look for pattern like "1 in X" or "1 IN X"
+            match = _RARITY_RE.search(description)
+            rarity_str = match.group(1) if match else None
         
         if rarity_str is None:
             return 0
-            
-        try:
-            # Clean up the string: remove commas, spaces, and "1 in " prefix
-            cleaned = rarity_str.replace(",", "").replace(" ", "")
-            if cleaned.lower().startswith("1in"):
-                cleaned = cleaned[3:]
-            return int(cleaned)
-        except ValueError:
-            return 0
+        
+        return _rarity_to_int(rarity_str)
+
+
+_USERNAME_SEARCH = PayloadParsingService.USERNAME_PATTERN.search
+
+
+# Streamer names and rarity strings repeat constantly in the feed, so cache them
+
+@lru_cache(maxsize=4096)
+def _extract_username(author_name: str) -> str:
+    """Cached implementation of PayloadParsingService.extract_username."""
+    match = _USERNAME_SEARCH(author_name)
+    if match:
+        name = match.group(1)
+    else:
+        name = author_name
+    
+    # Remove @ prefix if present, lowercase for consistency
+    return name.replace("@", "").lower()
+
+
+@lru_cache(maxsize=2048)
+def _rarity_to_int(rarity_str: str) -> int:
+    """Cached rarity string to integer conversion."""
+    try:
+        # Clean up the string: remove commas, spaces, and "1 in " prefix
+        cleaned = rarity_str.replace(",", "").replace(" ", "")
+        if cleaned.lower().startswith("1in"):
+            cleaned = cleaned[3:]
+        return int(cleaned)
+    except ValueError:
+        return 0
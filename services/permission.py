@@ -10,6 +10,16 @@ from .protocols import DiscordGateway
 logger = logging.getLogger(__name__)
 
 
+def _pack_key(guild_id: int, user_id: int, required_role_id: int) -> int:
+    """Pack three 64-bit snowflakes into a single int cache key."""
+    return (guild_id << 128) | (user_id << 64) | required_role_id
+
+
+def _role_ids(member) -> frozenset[int]:
+    """Role IDs held by a member, as a set for O(1) membership checks."""
+    return getattr(member, "role_ids", None) or frozenset(role.id for role in member.roles)
+
+
 class PermissionService:
     """Checks user permissions with caching."""
     
@@ -30,6 +40,11 @@ class PermissionService:
             )
         else:
             self._cache = None
+        
+        # Secondary indexes for selective invalidation (may hold expired keys)
+        self._keys_by_guild: dict[int, set[int]] = {}
+        self._keys_by_user: dict[int, set[int]] = {}
+        self._indexed_count = 0
     
     async def check_user_permission(
         self,
@@ -53,10 +68,12 @@ class PermissionService:
             return True
         
         # Check cache first
-        cache_key = (guild_id, user_id, required_role_id)
-        if self._cache is not None and cache_key in self._cache:
-            logger.debug(f"Permission cache hit: {cache_key}")
-            return self._cache[cache_key]
+        cache_key = _pack_key(guild_id, user_id, int(required_role_id))
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Permission cache hit: ({guild_id}, {user_id}, {required_role_id})")
+                return cached
         
         # Fetch from Discord API
         result = await self._check_discord_permission(guild_id, user_id, required_role_id)
@@ -64,9 +81,76 @@ class PermissionService:
         # Cache result
         if self._cache is not None:
             self._cache[cache_key] = result
+            self._index_key(cache_key, guild_id, user_id)
         
         return result
     
+    async def check_user_permissions_batch(
+        self,
+        checks: list[tuple[int, int, int | None]],
+    ) -> list[bool]:
+        """
+        Check several permissions, resolving each member only once.
+        
+        Args:
+            checks: (guild_id, user_id, required_role_id) tuples
+            
+        Returns:
+            One result per check, in the same order
+        """
+        results: list[bool] = [True] * len(checks)
+        pending: dict[tuple[int, int], list[int]] = {}
+        
+        for i, (guild_id, user_id, required_role_id) in enumerate(checks):
+            # No role requirement = always allowed
+            if not required_role_id:
+                continue
+            
+            if self._cache is not None:
+                cached = self._cache.get(_pack_key(guild_id, user_id, int(required_role_id)))
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            
+            pending.setdefault((guild_id, user_id), []).append(i)
+        
+        # One member lookup per (guild, user), roles checked locally
+        for (guild_id, user_id), indexes in pending.items():
+            member = await self._resolve_member(guild_id, user_id)
+            role_ids = _role_ids(member) if member is not None else frozenset()
+            
+            for i in indexes:
+                required_id = int(checks[i][2])
+                result = required_id in role_ids
+                results[i] = result
+                
+                if self._cache is not None:
+                    cache_key = _pack_key(guild_id, user_id, required_id)
+                    self._cache[cache_key] = result
+                    self._index_key(cache_key, guild_id, user_id)
+        
+        return results
+    
+    def _index_key(self, cache_key: int, guild_id: int, user_id: int) -> None:
+        """Record a cache key in the guild/user indexes."""
+        self._keys_by_guild.setdefault(guild_id, set()).add(cache_key)
+        self._keys_by_user.setdefault(user_id, set()).add(cache_key)
+        self._indexed_count += 1
+        
+        # Expired/evicted keys linger in the indexes; rebuild once they dominate
+        if self._indexed_count > 2 * self._cache.maxsize:
+            self._rebuild_indexes()
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the guild/user indexes from live cache keys."""
+        self._keys_by_guild.clear()
+        self._keys_by_user.clear()
+        mask = (1 << 64) - 1
+        for key in list(self._cache.keys()):
+            self._keys_by_guild.setdefault(key >> 128, set()).add(key)
+            self._keys_by_user.setdefault((key >> 64) & mask, set()).add(key)
+        self._indexed_count = len(self._cache)
+    
     async def _check_discord_permission(
         self,
         guild_id: int,
@@ -74,23 +158,30 @@ class PermissionService:
         required_role_id: int
     ) -> bool:
         """Perform actual Discord API permission check."""
+        member = await self._resolve_member(guild_id, user_id)
+        if member is None:
+            return False
+        
+        # Check if member has required role
+        return int(required_role_id) in _role_ids(member)
+    
+    async def _resolve_member(self, guild_id: int, user_id: int):
+        """Get guild member from cache or Discord API, None if unavailable."""
         guild = self._gateway.get_guild(guild_id)
         if not guild:
             logger.debug(f"Guild {guild_id} not found in cache")
-            return False
-        
-        try:
-            member = await self._gateway.fetch_member(guild_id, user_id)
-        except Exception as e:
-            logger.debug(f"Failed to fetch member {user_id} in guild {guild_id}: {e}")
-            return False
+            return None
         
+        # Prefer the member cache, only hit the API on a miss
+        member = self._gateway.get_member(guild_id, user_id)
         if member is None:
-            return False
+            try:
+                member = await self._gateway.fetch_member(guild_id, user_id)
+            except Exception as e:
+                logger.debug(f"Failed to fetch member {user_id} in guild {guild_id}: {e}")
+                return None
         
-        # Check if member has required role
-        required_id = int(required_role_id)
-        return any(role.id == required_id for role in member.roles)
+        return member
     
     def invalidate_cache(self, guild_id: int | None = None, user_id: int | None = None):
         """
@@ -105,17 +196,21 @@ class PermissionService:
         
         if guild_id is None and user_id is None:
             self._cache.clear()
+            self._keys_by_guild.clear()
+            self._keys_by_user.clear()
+            self._indexed_count = 0
             return
         
-        # Selective invalidation
-        keys_to_remove = []
-        for key in self._cache:
-            g_id, u_id, _ = key
-            if guild_id is not None and g_id != guild_id:
-                continue
-            if user_id is not None and u_id != user_id:
-                continue
-            keys_to_remove.append(key)
+        # Selective invalidation via the indexes
+        if guild_id is not None and user_id is not None:
+            keys_to_remove = (
+                self._keys_by_guild.get(guild_id, set())
+                & self._keys_by_user.get(user_id, set())
+            )
+        elif guild_id is not None:
+            keys_to_remove = self._keys_by_guild.pop(guild_id, set())
+        else:
+            keys_to_remove = self._keys_by_user.pop(user_id, set())
         
         for key in keys_to_remove:
             self._cache.pop(key, None)
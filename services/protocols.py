@@ -1,9 +1,14 @@
 """Service layer protocols (interfaces)."""
-from typing import Protocol, runtime_checkable
+from typing import NewType, Protocol
 from dataclasses import dataclass
 
 
-@dataclass
+# Username already normalized to lowercase (see UsernameValidationService.validate).
+# UsernameCache implementations never re-lowercase these.
+LoweredUsername = NewType("LoweredUsername", str)
+
+
+@dataclass(frozen=True, slots=True)
 class ParsedEmbed:
     """Parsed notification embed data."""
     name: str
@@ -19,9 +24,10 @@ class ParsedEmbed:
     timestamp: str
     color: int
     is_rare_format: bool = False  # True if using rare aura format (separate rarity field)
+    rarity_int: int = 0  # Numeric rarity ("1 in X" -> X), 0 if unknown
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GuildSettings:
     """Guild configuration data."""
     guild_id: int
@@ -31,7 +37,7 @@ class GuildSettings:
     required_role_id: int | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WebhookTarget:
     """Target for webhook delivery."""
     url: str
@@ -39,7 +45,7 @@ class WebhookTarget:
     user_id: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeliveryResult:
     """Result of a webhook delivery attempt."""
     target: WebhookTarget
@@ -47,24 +53,32 @@ class DeliveryResult:
     error: str | None = None
 
 
-@runtime_checkable
 class UsernameCache(Protocol):
-    """Interface for username cache operations."""
+    """Interface for username cache operations. All usernames must be pre-lowercased."""
     
-    def contains(self, username: str) -> bool:
+    def __contains__(self, username: LoweredUsername) -> bool:
         """Check if username is in cache."""
         ...
     
-    def add(self, username: str) -> None:
+    def contains(self, username: LoweredUsername) -> bool:
+        """Check if username is in cache."""
+        ...
+    
+    def add(self, username: LoweredUsername) -> None:
         """Add username to cache."""
         ...
     
-    def remove(self, username: str) -> None:
+    def remove(self, username: LoweredUsername) -> None:
         """Remove username from cache."""
         ...
     
     def as_set(self) -> frozenset[str]:
-        """Get all usernames as frozen set for fast lookup."""
+        """
+        Get all usernames as frozen set for fast lookup.
+        
+        Must be O(1): return a snapshot maintained by add/remove/refresh_from_db,
+        never build the set on each call.
+        """
         ...
     
     async def refresh_from_db(self) -> None:
@@ -72,15 +86,14 @@ class UsernameCache(Protocol):
         ...
 
 
-@runtime_checkable
 class DeduplicationCache(Protocol):
     """Interface for notification deduplication."""
     
-    def is_duplicate(self, notification_hash: str) -> bool:
+    def is_duplicate(self, notification_hash: bytes) -> bool:
         """Check if notification was recently processed."""
         ...
     
-    def record(self, notification_hash: str) -> None:
+    def record(self, notification_hash: bytes) -> None:
         """Record notification as processed."""
         ...
     
@@ -89,7 +102,6 @@ class DeduplicationCache(Protocol):
         ...
 
 
-@runtime_checkable
 class NotificationQueue(Protocol):
     """Interface for notification queue."""
     
@@ -110,7 +122,6 @@ class NotificationQueue(Protocol):
         ...
 
 
-@runtime_checkable
 class DiscordGateway(Protocol):
     """Interface for Discord API operations."""
     
@@ -122,6 +133,10 @@ class DiscordGateway(Protocol):
         """Get user from cache."""
         ...
     
+    def get_member(self, guild_id: int, user_id: int):
+        """Get member from cache, None if not cached."""
+        ...
+    
     async def fetch_member(self, guild_id: int, user_id: int):
         """Fetch member from Discord API."""
         ...
@@ -0,0 +1,76 @@
+"""
+Rate Limiting
+
+Client-side limits for outgoing webhook requests.
+"""
+import asyncio
+import random
+import time
+
+
+class WebhookBucket:
+    """Async token bucket for a single webhook URL."""
+    
+    __slots__ = ("_rate", "_burst", "_tokens", "_last", "_lock")
+    
+    def __init__(self, rate: float = 2.5, burst: int = 5):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then consume one token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold off the next token for at least `seconds` (server-reported reset)."""
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        self._tokens = min(self._tokens, 1 - seconds * self._rate)
+    
+    def update_from_headers(self, headers) -> None:
+        """Sync with Discord's X-RateLimit-* headers when the bucket is exhausted."""
+        if headers.get("x-ratelimit-remaining") != "0":
+            return
+        try:
+            self.pause(float(headers.get("x-ratelimit-reset-after", "")))
+        except ValueError:
+            pass
+
+
+def retry_delay(headers, body: dict | None, attempt: int, base_delay: float = 1.0) -> float:
+    """
+    Seconds to wait before retrying a rate-limited (429) request.
+    
+    Uses Discord's retry-after value when present, adding exponential
+    backoff with jitter on repeated failures.
+    """
+    retry_after = None
+    header = headers.get("retry-after")
+    if header:
+        try:
+            retry_after = float(header)
+        except ValueError:
+            pass
+    if retry_after is None:
+        try:
+            retry_after = float(body.get("retry_after"))
+        except Exception:
+            retry_after = base_delay
+    
+    if attempt > 0:
+        retry_after += random.uniform(0, base_delay * (2 ** attempt))
+    return retry_after
@@ -79,28 +79,17 @@ class UserService:
             GuildWebhookError: If guild has no webhook
             ItemExistsError: If already subscribed
         """
-        from models import GuildSettings
-        
-        # Get or create guild settings
-        guild_settings, _ = await GuildSettings.get_or_create(
-            guild_id=guild_id,
-            defaults={"name": guild_name}
-        )
+        policy = await GuildRepository.get_policy(guild_id, guild_name)
         
         # Business rules
-        if not guild_settings.allow_posting:
+        if not policy.allow_posting:
             raise GuildNotAllowedError("Guild does not allow posting")
-        if not guild_settings.post_channel_webhook:
+        if not policy.webhook:
             raise GuildWebhookError("Guild has no webhook configured")
         
-        # Check existing subscription
-        current_guilds = await UserRepository.get_guilds(user_id)
-        if guild_id in current_guilds:
+        # Add subscription (no-op if already subscribed)
+        if not await UserRepository.subscribe_guild(user_id, guild_id):
             raise ItemExistsError("Already subscribed to this guild")
-        
-        # Add subscription
-        current_guilds.append(guild_id)
-        await UserRepository.update_guilds(user_id, current_guilds)
     
     @staticmethod
     async def remove_guild_subscription(user_id: int, guild_id: int) -> None:
@@ -110,13 +99,8 @@ class UserService:
         Raises:
             ItemNotFoundError: If not subscribed
         """
-        current_guilds = await UserRepository.get_guilds(user_id)
-        
-        if guild_id not in current_guilds:
+        if not await UserRepository.unsubscribe_guild(user_id, guild_id):
             raise ItemNotFoundError("Not subscribed to this guild")
-        
-        current_guilds.remove(guild_id)
-        await UserRepository.update_guilds(user_id, current_guilds)
     
     @staticmethod
     async def view_user_guilds(user_id: int) -> list[int]:
@@ -126,7 +110,18 @@ class UserService:
         Raises:
             ItemNotFoundError: If no subscriptions
         """
-        guilds = await UserRepository.get_guilds(user_id)
+        guilds = (await UserService.view_user_guilds_bulk([user_id]))[user_id]
         if not guilds:
             raise ItemNotFoundError("No guild subscriptions")
         return guilds
+    
+    @staticmethod
+    async def view_user_guilds_bulk(user_ids: list[int]) -> dict[int, list[int]]:
+        """
+        Get guild subscriptions for many users with a single query.
+        
+        Returns:
+            Mapping of every requested user ID to its guild IDs (empty if none)
+        """
+        found = await UserRepository.get_guilds_bulk(user_ids)
+        return {user_id: found.get(user_id, []) for user_id in user_ids}
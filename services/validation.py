@@ -2,16 +2,36 @@
 Validation Services
 
 Pure functions for input validation and sanitization.
+
+Usernames leave UsernameValidationService.validate lowercased; that is the
+ingestion boundary for the LoweredUsername invariant, so the username cache
+and notification hot path never lowercase again.
 """
 import re
-from urllib.parse import urlparse
+import string
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .config import ValidationConfig
 from .exceptions import ValidationError
+from .protocols import LoweredUsername
+
+
+_SCHEMES = ("https://", "http://")
+_WEBHOOK_PATH = "/api/webhooks/"
+_MAX_WEBHOOK_URL_LENGTH = 512
+# scheme://host/api/webhooks/<id>/<token>[/...][?query]
+_WEBHOOK_RE = re.compile(
+    r'https?://([A-Za-z0-9.-]{1,253})'
+    r'/api/webhooks/(\d{17,20})/([A-Za-z0-9_-]{1,128})'
+    r'(?:/[^?#]*)?(?:[?#].*)?'
+)
 
+# Deletes every allowed character; anything left over is invalid
+_USERNAME_STRIP = str.maketrans("", "", string.ascii_letters + string.digits + "_")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ValidatedWebhook:
     """Validated webhook URL with extracted components."""
     url: str
@@ -24,6 +44,10 @@ class WebhookValidationService:
     
     def __init__(self, config: ValidationConfig | None = None):
         self._config = config or ValidationConfig()
+        
+        domains = [d.lower() for d in self._config.webhook_valid_domains]
+        self._exact_domains = frozenset(domains)
+        self._dot_domains = tuple("." + d for d in domains)
     
     def validate(self, url: str) -> ValidatedWebhook:
         """
@@ -32,58 +56,28 @@ class WebhookValidationService:
         Raises:
             ValidationError: If URL is invalid
         """
+        result, error = self._validate_impl(url)
+        if error:
+            raise ValidationError("webhook_url", error)
+        return result
+    
+    def is_valid(self, url: str) -> bool:
+        """Check if URL is valid without raising."""
+        return self._validate_impl(url)[0] is not None
+    
+    def _validate_impl(self, url: str) -> tuple[ValidatedWebhook | None, str | None]:
+        """Validate without raising; returns (result, None) or (None, error message)."""
         if not url or not isinstance(url, str):
-            raise ValidationError("webhook_url", "URL cannot be empty")
+            return None, "URL cannot be empty"
         
-        try:
-            parsed = urlparse(url)
-        except Exception as e:
-            raise ValidationError("webhook_url", f"Invalid URL format: {e}")
+        if len(url) > _MAX_WEBHOOK_URL_LENGTH:
+            return None, "URL too long"
         
-        # Check scheme
-        if parsed.scheme not in ("http", "https"):
-            raise ValidationError("webhook_url", "URL must use HTTPS")
+        # Cheap rejection before the regex engine gets involved
+        if not url.startswith(_SCHEMES) or _WEBHOOK_PATH not in url:
+            return None, "URL must be a Discord webhook endpoint"
         
-        # Check domain
-        netloc = parsed.netloc.lower()
-        is_valid_domain = any(
-            netloc == domain or netloc.endswith("." + domain)
-            for domain in self._config.webhook_valid_domains
-        )
-        if not is_valid_domain:
-            raise ValidationError(
-                "webhook_url", 
-                f"URL must be a Discord domain, got '{netloc}'"
-            )
-        
-        # Check path
-        if "/api/webhooks/" not in parsed.path:
-            raise ValidationError("webhook_url", "URL must be a webhook endpoint")
-        
-        # Extract ID and token
-        path_parts = parsed.path.split("/")
-        try:
-            webhooks_idx = path_parts.index("webhooks")
-            webhook_id = path_parts[webhooks_idx + 1]
-            token = path_parts[webhooks_idx + 2]
-        except (ValueError, IndexError):
-            raise ValidationError("webhook_url", "Could not extract webhook ID and token")
-        
-        # Validate format
-        if not re.match(r'^\d+$', webhook_id):
-            raise ValidationError("webhook_url", "Invalid webhook ID format")
-        if not re.match(r'^[A-Za-z0-9_-]+$', token):
-            raise ValidationError("webhook_url", "Invalid webhook token format")
-        
-        return ValidatedWebhook(url=url, webhook_id=webhook_id, token=token)
-    
-    def is_valid(self, url: str) -> bool:
-        """Check if URL is valid without raising."""
-        try:
-            self.validate(url)
-            return True
-        except ValidationError:
-            return False
+        return _validate_webhook_cached(url, self._exact_domains, self._dot_domains)
 
 
 class UsernameValidationService:
@@ -92,7 +86,7 @@ class UsernameValidationService:
     def __init__(self, config: ValidationConfig | None = None):
         self._config = config or ValidationConfig()
     
-    def validate(self, username: str) -> str:
+    def validate(self, username: str) -> LoweredUsername:
         """
         Validate and normalize username.
         
@@ -102,36 +96,64 @@ class UsernameValidationService:
         Raises:
             ValidationError: If username is invalid
         """
+        result, error = self._validate_impl(username)
+        if error:
+            raise ValidationError("username", error)
+        return result
+    
+    def is_valid(self, username: str) -> bool:
+        """Check if username is valid without raising."""
+        return self._validate_impl(username)[0] is not None
+    
+    def _validate_impl(self, username: str) -> tuple[LoweredUsername | None, str | None]:
+        """Validate without raising; returns (normalized, None) or (None, error message)."""
         if not username or not isinstance(username, str):
-            raise ValidationError("username", "Username cannot be empty")
-        
-        username = username.strip()
-        
-        if len(username) < self._config.username_min_length:
-            raise ValidationError(
-                "username", 
-                f"Username must be at least {self._config.username_min_length} character(s)"
-            )
+            return None, "Username cannot be empty"
         
-        if len(username) > self._config.username_max_length:
-            raise ValidationError(
-                "username",
-                f"Username cannot exceed {self._config.username_max_length} characters"
-            )
+        max_len = self._config.username_max_length
+        # Bound strip() and keep oversized input out of the cache; the slack covers surrounding whitespace
+        if len(username) > max_len + 8:
+            return None, f"Username cannot exceed {max_len} characters"
         
-        # Basic character validation (alphanumeric + underscore, Roblox standard)
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
-            raise ValidationError(
-                "username",
-                "Username can only contain letters, numbers, and underscores"
-            )
-        
-        return username.lower()
+        return _validate_username_cached(username, self._config.username_min_length, max_len)
+
+
+@lru_cache(maxsize=2048)
+def _validate_webhook_cached(
+    url: str,
+    exact_domains: frozenset[str],
+    dot_domains: tuple[str, ...],
+) -> tuple[ValidatedWebhook | None, str | None]:
+    """Match and split a prefiltered webhook URL. Results (including failures) are memoized."""
+    match = _WEBHOOK_RE.fullmatch(url)
+    if not match:
+        return None, "URL must be a Discord webhook endpoint"
     
-    def is_valid(self, username: str) -> bool:
-        """Check if username is valid without raising."""
-        try:
-            self.validate(username)
-            return True
-        except ValidationError:
-            return False
+    host, webhook_id, token = match.groups()
+    host = host.lower()
+    if host not in exact_domains and not host.endswith(dot_domains):
+        return None, "Invalid webhook domain"
+    
+    return ValidatedWebhook(url=url, webhook_id=webhook_id, token=token), None
+
+
+@lru_cache(maxsize=4096)
+def _validate_username_cached(
+    username: str,
+    min_len: int,
+    max_len: int,
+) -> tuple[LoweredUsername | None, str | None]:
+    """Strip, check and lowercase a username. Results (including failures) are memoized."""
+    username = username.strip()
+    
+    if len(username) < min_len:
+        return None, f"Username must be at least {min_len} character(s)"
+    
+    if len(username) > max_len:
+        return None, f"Username cannot exceed {max_len} characters"
+    
+    # Basic character validation (alphanumeric + underscore, Roblox standard)
+    if username.translate(_USERNAME_STRIP):
+        return None, "Username can only contain letters, numbers, and underscores"
+    
+    return LoweredUsername(username.lower()), None